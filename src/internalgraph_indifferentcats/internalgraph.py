@@ -3,10 +3,27 @@ Very simple graph storage class with primitive query and serialization.
 """
 
 import datetime
+import os
 import uuid
 import json
+import warnings
+import weakref
 from abc import ABC
-from typing import Any, Iterator, List, Optional, Set, Tuple, Union
+from functools import cached_property
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:  # optional, much faster JSON encoding
+    import orjson
+except ImportError:
+    orjson = None
+
+# bound once; uuid.uuid4() adds a call layer on every element created
+_urandom = os.urandom
+_UUID = uuid.UUID
+
+# keys kept at the top level by serialize(); the rest go in short_details
+_DEFAULT_SPLIT = frozenset({"id", "label", "description", "type"})
+_EDGE_SPLIT = _DEFAULT_SPLIT | {"start", "end"}
 
 
 class BaseGraphElement(ABC):
@@ -14,6 +31,16 @@ class BaseGraphElement(ABC):
     Abstract base class for Elements within a graph.  Contains common methods and
     attributes, but should not be instantiated directly.
     """
+    __slots__ = ('_properties', 'id', '_graphs', '_serialize_cache',
+                 '__weakref__')
+    _properties: dict
+    id: Union[uuid.UUID, str]
+    _graphs: Union[None, 'weakref.ref[InternalGraph]',
+                   'weakref.WeakSet[InternalGraph]']
+    # (_cache_key(), serialized dict) for the default split
+    _serialize_cache: Optional[Tuple[tuple, dict]]
+    # keys kept at the top level by serialize() when no split_list is given
+    _default_split = _DEFAULT_SPLIT
 
     def __init__(self, id: Optional[Union[uuid.UUID, str]] = None,
                  properties: Optional[dict] = None):
@@ -21,10 +48,16 @@ class BaseGraphElement(ABC):
         Constructor.
         :param id: Optional.  UUID to assign the element.
                    Auto-generated otherwise
-        :param properties: Optional.  Dictionary of attributes.
+        :param properties: Optional.  Dictionary of attributes.  It is
+                           copied, so later changes must go through
+                           _set_property()_.
         """
-        self._properties = properties if properties else dict()
-        self.id = id if id else uuid.uuid4()
+        self._properties = dict(properties) if properties else dict()
+        self.id = id if id else _UUID(bytes=_urandom(16), version=4)
+        # graphs holding this element, told when properties change: None,
+        # a weak reference to one graph, or a WeakSet once there are more
+        self._graphs = None
+        self._serialize_cache = None
 
     def set_property(self, name: str, value: Any):
         """
@@ -38,6 +71,59 @@ class BaseGraphElement(ABC):
         :return: None
         """
         self._properties[name] = value
+        self._serialize_cache = None
+        graphs = self._graphs
+        if graphs is None:
+            return
+        if isinstance(graphs, weakref.ref):
+            graph = graphs()
+            if graph is not None:
+                graph._invalidate_property_cache()
+            return
+        for graph in graphs:
+            graph._invalidate_property_cache()
+
+    def _register_graph(self, graph: 'InternalGraph') -> None:
+        """
+        Remember, without keeping it alive, a graph that holds this element.
+        Most elements only ever belong to one graph, so a plain weak
+        reference is kept until a second graph shows up.
+        :param graph: InternalGraph the element was added to
+        :return: None
+        """
+        graphs = self._graphs
+        if graphs is None:
+            self._graphs = weakref.ref(graph)
+        elif isinstance(graphs, weakref.ref):
+            current = graphs()
+            if current is graph:
+                return
+            if current is None:
+                self._graphs = weakref.ref(graph)
+            else:
+                self._graphs = weakref.WeakSet((current, graph))
+        else:
+            graphs.add(graph)
+
+    def __getstate__(self) -> dict:
+        """
+        Attribute values for pickle/copy, leaving out the graph
+        back-references and the serialization cache.  A graph that is
+        copied registers itself again with its copied elements.
+        :return: dictionary of attribute names and values
+        """
+        return {'_properties': self._properties, 'id': self.id}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore an element from `__getstate__()` output.
+        :param state: dictionary of attribute names and values
+        :return: None
+        """
+        self._graphs = None
+        self._serialize_cache = None
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def get_property(self, name: str, no_error=False) -> Any:
         """
@@ -57,43 +143,64 @@ class BaseGraphElement(ABC):
         return self._properties[name]  # with built-in exceptions
 
     @staticmethod
-    def split_dict(in_dict: dict, strip_list: List[str]) -> Tuple[dict, dict]:
+    def split_dict(in_dict: dict,
+                   strip_list: Iterable[str]) -> Tuple[dict, dict]:
         """
         Return two lists.  Any item in in_dict whose key is in strip_list
         gets filtered into the first list in the return value.  All other
         key/value pairs are returned in the second.
         @param in_dict: input dictionary who keys will be compared to strip_list
-        @param strip_list: list of key names to put in the first output
+        @param strip_list: list (or set) of key names to put in the first output
         @return: A list of two dictionaries.  The first has items stripped out
                  of the in_dict and the second has all other attributes
         """
-        left = dict()
-        right = dict()
         if not strip_list:
             raise ValueError("strip_list must be non-empty")
+        strip = strip_list if isinstance(strip_list, frozenset) \
+            else frozenset(strip_list)
+        if in_dict.keys().isdisjoint(strip):
+            return dict(), dict(in_dict)
+        left = dict()
+        right = dict()
         for k, v in in_dict.items():
-            if k in strip_list:
+            if k in strip:
                 left[k] = v
             else:
                 right[k] = v
         return left, right  # tuple
 
-    def __dict__(self):
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the properties and the element's ID as key/value pairs
+        without building a merged dictionary.
+        :return: Iterator of (key, value) tuples
+        """
+        yield from self._properties.items()
+        yield 'id', self.id
+
+    def as_dict(self) -> dict:
         """
         The graph element represented as a dictionary.
         :return: Dictionary of properties and the element's ID
         """
-        return self._properties | {'id': self.id}
+        return dict(self.items())
+
+    def __dict__(self) -> dict:
+        """
+        Deprecated alias of _as_dict()_.
+        :return: Dictionary of properties and the element's ID
+        """
+        warnings.warn("__dict__() is deprecated, use as_dict()",
+                      DeprecationWarning, stacklevel=2)
+        return self.as_dict()
 
     def __iter__(self):
         """
         Iterate through all properties which can be queried
         :return: List of strings to feed to _get_property()_
         """
-        key_list = list(self._properties.keys())
-        key_list.append(self.id)
-        for k in set(key_list):
-            yield k
+        yield from self._properties
+        yield self.id
 
     def __repr__(self):
         """
@@ -102,28 +209,48 @@ class BaseGraphElement(ABC):
         missing, it says that too.
         :return: a string
         """
-        if self._properties.get('label'):
-            return f'<{self.__class__.__name__} "{self._properties["label"]}" ' \
-                   f'ID {str(self.id)}>'
-        return f'<{self.__class__.__name__} ID {str(self.id)} (no "label" property)>'
+        label = self._properties.get('label')
+        if label:
+            return f'<{type(self).__name__} "{label}" ID {self.id}>'
+        return f'<{type(self).__name__} ID {self.id} (no "label" property)>'
 
     def serialize(self,
-                  split_list: Optional[List[str]] = None) -> dict:
+                  split_list: Optional[Iterable[str]] = None) -> dict:
         """
         Generalized method to get all attributes in derived classes and
-        serializing properties
+        serializing properties.  The result for the default _split_list_ is
+        cached until _set_property()_ is called or the ID (or an edge's
+        endpoints) change; callers get a copy they are free to modify.
         :return: dictionary for the object
         """
         if not split_list:
-            split_list = [
-                "id",
-                "label",
-                "description",
-                "type",
-            ]
-        original = self.__dict__()
-        outer, inner = self.split_dict(original, split_list)
-        return outer | {"short_details": inner}
+            key = self._cache_key()
+            cache = self._serialize_cache
+            if cache is None or cache[0] != key:
+                cache = (key, self._serialize(self._default_split))
+                self._serialize_cache = cache
+            outer = dict(cache[1])
+            outer["short_details"] = dict(outer["short_details"])
+            return outer
+        return self._serialize(split_list)
+
+    def _cache_key(self) -> tuple:
+        """
+        The public attributes that go into _serialize()_ output besides the
+        properties.  A cached result is stale once these change.
+        :return: tuple of attribute values
+        """
+        return (self.id,)
+
+    def _serialize(self, split_list: Iterable[str]) -> dict:
+        """
+        Build the serialized form of the element.
+        :param split_list: keys to keep at the top level
+        :return: dictionary for the object
+        """
+        outer, inner = self.split_dict(self.as_dict(), split_list)
+        outer["short_details"] = inner
+        return outer
 
 
 class Node(BaseGraphElement):
@@ -134,7 +261,29 @@ class Node(BaseGraphElement):
     preference for properties _name_ and _type_ for visualization
     labels and visualization iconography, respectively.
     """
-    pass
+    __slots__ = ()
+
+    @classmethod
+    def bulk_create(cls, n: int,
+                    properties_list: Optional[List[dict]] = None) -> List['Node']:
+        """
+        Create _n_ nodes with random IDs, drawing the randomness for all of
+        them in a single `os.urandom` call.
+        :param n: Number of nodes to create
+        :param properties_list: Optional.  One properties dictionary per node
+        :return: List of new Node objects
+        Raises: ValueError if _properties_list_ does not have _n_ entries
+        """
+        if properties_list is None:
+            properties_list = [None] * n
+        elif len(properties_list) != n:
+            raise ValueError("properties_list must have n entries")
+        raw = _urandom(16 * n)
+        return [
+            cls(id=_UUID(bytes=raw[i * 16:i * 16 + 16], version=4),
+                properties=properties)
+            for i, properties in enumerate(properties_list)
+        ]
 
 
 class Edge(BaseGraphElement):
@@ -144,6 +293,11 @@ class Edge(BaseGraphElement):
     preference for properties _name_ and _type_ for visualization
     labels and visualization iconography, respectively.
     """
+    __slots__ = ('from_id', 'to_id')
+    from_id: Union[uuid.UUID, str]
+    to_id: Union[uuid.UUID, str]
+    _default_split = _EDGE_SPLIT
+
     def __init__(self,
                  from_id: Union[uuid.UUID, str], to_id: Union[uuid.UUID, str],
                  id: Optional[uuid.UUID] = None,
@@ -159,31 +313,33 @@ class Edge(BaseGraphElement):
         self.from_id = from_id
         self.to_id = to_id
 
-    def __dict__(self) -> dict:
+    def items(self) -> Iterator[Tuple[str, Any]]:
         """
-        The graph element represented as a dictionary.
-        @return: Dictionary of properties and the element's ID
+        Iterate over the properties, the element's ID and the endpoints as
+        key/value pairs without building a merged dictionary.
+        @return: Iterator of (key, value) tuples
         """
-        return self._properties | {
-            'id': self.id,
-            'start': self.from_id,
-            'end': self.to_id
-        }
+        yield from super().items()
+        yield 'start', self.from_id
+        yield 'end', self.to_id
 
-    def serialize(self) -> dict:
+    def __getstate__(self) -> dict:
         """
-        The graph element represented in a format for lambda.
-        :return:
+        Attribute values for pickle/copy, including the endpoints.
+        @return: dictionary of attribute names and values
         """
-        split_list = [
-            "id",
-            "label",
-            "description",
-            "type",
-            "start",
-            "end",
-        ]
-        return super().serialize(split_list=split_list)
+        state = super().__getstate__()
+        state['from_id'] = self.from_id
+        state['to_id'] = self.to_id
+        return state
+
+    def _cache_key(self) -> tuple:
+        """
+        The ID and endpoints, which go into _serialize()_ output besides the
+        properties.
+        @return: tuple of attribute values
+        """
+        return self.id, self.from_id, self.to_id
 
 class InternalGraph:
     """
@@ -196,7 +352,10 @@ class InternalGraph:
     locate all adjacent nodes.  With these techniques, all connected nodes
     can be explored, but isolated nodes or subgraphs will be hidden.
     Graphs cannot be merged, but the public attributes `nodes` and `edges`
-    can be copied over to another InternalGraph instance.
+    can be copied over to another InternalGraph instance.  They must only
+    be grown through _add_node()_ and _add_edge()_, and the IDs and
+    endpoints of elements must not change once they are in a graph, as
+    the graph indexes them.
     """
 
     def __init__(self, nodes: Optional[list] = None,
@@ -209,9 +368,25 @@ class InternalGraph:
         self.nodes: List[Node] = nodes if nodes else list()
         self.edges: List[Edge] = edges if edges else list()
         self._all_node_ids = set()
+        self._all_edge_ids = set()
+        # adjacency indexes: node ID -> outgoing / incoming edges
+        self._out: Dict[Union[uuid.UUID, str], List[Edge]] = dict()
+        self._in: Dict[Union[uuid.UUID, str], List[Edge]] = dict()
+        self._id_to_node: Dict[Union[uuid.UUID, str], Node] = dict()
+        self._id_to_edge: Dict[Union[uuid.UUID, str], Edge] = dict()
+        # edge ID -> position in `edges`, for stable query output
+        self._edge_order: Dict[Union[uuid.UUID, str], int] = dict()
+        # aggregated property values per key, built on first query; the
+        # property names are the _all_*_property_names cached properties
+        self._node_property_values: Dict[str, set] = dict()
+        self._edge_property_values: Dict[str, set] = dict()
         if nodes:
             for x in nodes:
                 self._all_node_ids.add(x.id)
+                self._index_node(x)
+        for e in self.edges:
+            self._all_edge_ids.add(e.id)
+            self._index_edge(e)
 
     def __str__(self) -> str:
         """
@@ -220,6 +395,21 @@ class InternalGraph:
         """
         return self.as_json()
 
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled or copied graph.  Elements do not carry their
+        graph back-references through a copy, so register with them again
+        and start with empty property caches.
+        :param state: the graph's attribute dictionary
+        :return: None
+        """
+        self.__dict__.update(state)
+        self._invalidate_property_cache()
+        for n in self.nodes:
+            n._register_graph(self)
+        for e in self.edges:
+            e._register_graph(self)
+
     def serialize(self) -> dict:
         """
         Return the object as a dict which can be rendered as JSON,
@@ -249,7 +439,7 @@ class InternalGraph:
         if isinstance(value, datetime.datetime):
             return value.strftime(datetime_format)
         if isinstance(value, Node) or isinstance(value, Edge):
-            return value.__dict__()
+            return value.as_dict()
         raise TypeError(
             'Unserializable object {} of type {}'.format(str(value),
                                                          type(value))
@@ -259,9 +449,26 @@ class InternalGraph:
         """
         Translate an InternalGraph to JSON in the format:
         `{ "name": graph_name, "nodes": [], "edges": [] }`
+        If _orjson_ is installed it is used for the default indent of 2.
+        Its output then differs from the _json_ module in three ways:
+        non-ASCII text is written as UTF-8 instead of `\\u` escapes,
+        NaN/Infinity become `null`, and `Enum` values are written as their
+        value where the _json_ module raises TypeError.  Anything orjson
+        rejects, such as non-string keys or integers wider than 64 bits,
+        falls back to the _json_ module.
         :param indent: Optional.  Integers make pretty strings.  None is minified.
         :return: a string
         """
+        if orjson is not None and indent == 2:
+            try:
+                return orjson.dumps(self.serialize(),
+                                    default=self._json_serialize_defaults,
+                                    option=orjson.OPT_INDENT_2
+                                    | orjson.OPT_PASSTHROUGH_DATETIME
+                                    | orjson.OPT_PASSTHROUGH_DATACLASS
+                                    ).decode()
+            except orjson.JSONEncodeError:
+                pass  # e.g. int keys; let json handle it or raise its error
         return json.dumps(self.serialize(),
                           default=self._json_serialize_defaults,
                           indent=indent)
@@ -280,18 +487,13 @@ class InternalGraph:
            'if (typeof nodes === "undefined") { nodes = []; }',
            'if (typeof edges === "undefined") { edges = []; }',
         ]
-        for node in self.nodes:
-            output.append(
-                'nodes.push(' + json.dumps(node.serialize(),
-                                           default=self._json_serialize_defaults,
-                                           indent=4) + ');'
-            )
-        for edge in self.edges:
-            output.append(
-                'edges.push(' + json.dumps(edge.serialize(),
-                                           default=self._json_serialize_defaults,
-                                           indent=4) + ');'
-            )
+        # one encoder for every element instead of one per json.dumps call
+        encode = json.JSONEncoder(default=self._json_serialize_defaults,
+                                  indent=4).encode
+        output.extend('nodes.push(' + encode(node.serialize()) + ');'
+                      for node in self.nodes)
+        output.extend('edges.push(' + encode(edge.serialize()) + ');'
+                      for edge in self.edges)
         return "\n".join(output)
 
     def get_node_neighbors(self, id: Union[uuid.UUID, str]) -> Iterator[Union[uuid.UUID, str]]:
@@ -301,23 +503,31 @@ class InternalGraph:
         :param id: Node ID to search
         :return: Iterator of neighbor UUIDs
         """
-        for e in self.edges:
-            if id == e.from_id:
-                yield e.to_id
-            if id == e.to_id:
-                yield e.from_id
+        for e in self._out.get(id, ()):
+            yield e.to_id
+        for e in self._in.get(id, ()):
+            yield e.from_id
 
-    def get_all_edges(self, node_ids: List[Union[uuid.UUID, str]]) -> Iterator[Edge]:
+    def get_all_edges(self, node_ids: Iterable[Union[uuid.UUID, str]]) -> Iterator[Edge]:
         """
         Get the edges for a collection of nodes so that a subgraph can
         be shown.  This is good if the list of nodes has been filtered in
         some way.
-        :param node_ids: List of node IDs
+        Edges are yielded in the order they were added to the graph.
+        :param node_ids: List (or set) of node IDs
         :return: List of Edge objects
         """
-        for e in self.edges:
-            if e.from_id in node_ids and e.to_id in node_ids:
-                yield e
+        ids = node_ids if isinstance(node_ids, (set, frozenset)) \
+            else set(node_ids)
+        found = [
+            e
+            for nid in ids
+            for e in self._out.get(nid, ())
+            if e.to_id in ids
+        ]
+        # set iteration order depends on hashing; keep the output stable
+        found.sort(key=lambda e: self._edge_order[e.id])
+        yield from found
 
     def add_node(self, node: Union[Node, List[Node]]) -> List:
         """
@@ -328,26 +538,65 @@ class InternalGraph:
         :param node: Node object(s)
         :return: List of nodes added that were not duplicative.
         """
+        if isinstance(node, Node):  # common single-node case, no list
+            if node.id in self._all_node_ids:
+                return []
+            self.nodes.append(node)
+            self._all_node_ids.add(node.id)
+            self._index_node(node)
+            return [node]
         added_nodes = list()
-        if not isinstance(node, list):
-            node = [node]
         for n in node:
             if n.id not in self._all_node_ids:
                 self.nodes.append(n)
                 self._all_node_ids.add(n.id)
+                self._index_node(n)
                 added_nodes.append(n)
         return added_nodes
 
     def add_edge(self, edge: Union[Edge, List[Edge]]) -> None:
         """
-        Add an edge to the graph.
-        :param edge: Edge object
+        Add an edge to the graph if an edge with the same ID is not already
+        present.
+        :param edge: Edge object(s)
         :return: None
         """
-        if isinstance(edge, list):
-            self.edges.extend(edge)
-        else:
-            self.edges.append(edge)
+        edges = (edge,) if isinstance(edge, Edge) else edge
+        for e in edges:
+            if e.id in self._all_edge_ids:
+                continue
+            self._all_edge_ids.add(e.id)
+            self.edges.append(e)
+            self._index_edge(e)
+
+    def _index_node(self, node: Node) -> None:
+        """
+        Record a node in the ID lookup and in any built property caches.
+        :param node: Node object already appended to `nodes`
+        :return: None
+        """
+        self._id_to_node[node.id] = node
+        node._register_graph(self)
+        self._update_property_cache(
+            node, self.__dict__.get('_all_node_property_names'),
+            self._node_property_values)
+
+    def _index_edge(self, edge: Edge) -> None:
+        """
+        Record an edge in the ID lookup, any built property caches and the
+        outgoing/incoming adjacency indexes so that traversal only needs to
+        look at the edges touching a node.
+        :param edge: Edge object already appended to `edges`
+        :return: None
+        """
+        self._id_to_edge[edge.id] = edge
+        self._edge_order.setdefault(edge.id, len(self._edge_order))
+        edge._register_graph(self)
+        self._update_property_cache(
+            edge, self.__dict__.get('_all_edge_property_names'),
+            self._edge_property_values)
+        self._out.setdefault(edge.from_id, []).append(edge)
+        self._in.setdefault(edge.to_id, []).append(edge)
 
     def node_exists(self, id: Union[uuid.UUID, str]) -> bool:
         """
@@ -357,6 +606,74 @@ class InternalGraph:
         """
         return id in self._all_node_ids
 
+    def _invalidate_property_cache(self) -> None:
+        """
+        Drop the aggregated property names/values so that the next query
+        rebuilds them.  Called by elements when a property is set.
+        :return: None
+        """
+        self.__dict__.pop('_all_node_property_names', None)
+        self.__dict__.pop('_all_edge_property_names', None)
+        self._node_property_values.clear()
+        self._edge_property_values.clear()
+
+    def _update_property_cache(self, element: BaseGraphElement,
+                               names: Optional[set],
+                               values: Dict[str, set]) -> None:
+        """
+        Fold a newly added element into already-built property caches.
+        Caches that have not been built yet are left alone.
+        :param element: Node or Edge just added to the graph
+        :param names: the property name cache for the element's kind
+        :param values: the property value cache for the element's kind
+        :return: None
+        """
+        if names is None and not values:
+            return
+        for k, v in element.items():
+            if names is not None:
+                names.add(k)
+            if k in values:
+                try:
+                    values[k].add(v)
+                except TypeError:  # unhashable, let the query raise it
+                    del values[k]
+
+    def _property_values(self, elements: list, values: Dict[str, set],
+                         filter_key: str) -> set:
+        """
+        Look up (building if needed) the set of values of _filter_key_
+        across _elements_.
+        :param elements: `nodes` or `edges`
+        :param values: the property value cache for those elements
+        :param filter_key: key name to grab values for
+        :return: set of values
+        """
+        if not filter_key:
+            return set()
+        if filter_key not in values:
+            values[filter_key] = {
+                v
+                for e in elements
+                for k, v in e.items()
+                if k == filter_key
+            }
+        return set(values[filter_key])
+
+    @cached_property
+    def _all_edge_property_names(self) -> Set[str]:
+        """
+        Cached set of all property names across all edges.  Extended in
+        place by _add_edge()_ and dropped by _set_property()_, so only the
+        copy from _get_all_edge_property_names()_ is handed out.
+        @return: set of "keys"
+        """
+        return {  # the set enforces uniqueness
+            k
+            for e in self.edges
+            for k, _ in e.items()
+        }
+
     def get_all_edge_property_names(self) -> set:
         """
         Return a set (unique list) of all property names (not values)
@@ -364,12 +681,7 @@ class InternalGraph:
         @return: set of "keys" or, if a filter key is provided, return those
                  values
         """
-        total = {  # the set enforces uniqueness
-            k
-            for e in self.edges
-            for k in e.__dict__().keys()
-        }
-        return total
+        return set(self._all_edge_property_names)
 
     def get_all_node_property_values(self,
                                      filter_key: str) \
@@ -381,13 +693,22 @@ class InternalGraph:
         @return: set of "keys" or, if a filter key is provided, return those
                  values
         """
-        total = {  # the set enforces uniqueness
-            v
-            for e in self.nodes
-            for k, v in e.__dict__().items()
-            if filter_key and k == filter_key
+        return self._property_values(self.nodes, self._node_property_values,
+                                     filter_key)
+
+    @cached_property
+    def _all_node_property_names(self) -> Set[str]:
+        """
+        Cached set of all property names across all nodes.  Extended in
+        place by _add_node()_ and dropped by _set_property()_, so only the
+        copy from _get_all_node_property_names()_ is handed out.
+        @return: set of "keys"
+        """
+        return {  # the set enforces uniqueness
+            k
+            for n in self.nodes
+            for k, _ in n.items()
         }
-        return total
 
     def get_all_node_property_names(self) -> set:
         """
@@ -396,12 +717,7 @@ class InternalGraph:
         @return: set of "keys" or, if a filter key is provided, return those
                  values
         """
-        total = {  # the set enforces uniqueness
-            k
-            for e in self.nodes
-            for k in e.__dict__().keys()
-        }
-        return total
+        return set(self._all_node_property_names)
 
     def get_all_edge_property_values(self,
                                      filter_key: str) \
@@ -413,13 +729,8 @@ class InternalGraph:
         @return: set of "keys" or, if a filter key is provided, return those
                  values
         """
-        total = {  # the set enforces uniqueness
-            v
-            for e in self.edges
-            for k, v in e.__dict__().items()
-            if filter_key and k == filter_key
-        }
-        return total
+        return self._property_values(self.edges, self._edge_property_values,
+                                     filter_key)
 
     # _NODE_ID_TYPE = Union[uuid.UUID, str]
     # def find_node(self, node_id: _NODE_ID_TYPE) -> Optional[Node]:
@@ -429,38 +740,50 @@ class InternalGraph:
     #     return None
 
     def __getitem__(self, name):
+        """
+        Look up a node or edge by ID.  A Node or Edge object may also be
+        passed, in which case its ID is used.
+        :param name: ID of a node or edge, or the element itself
+        :return: The matching Node or Edge, or None if not in the graph
+        """
+        found = self._id_to_node.get(name)
+        if found is not None:
+            return found
+        found = self._id_to_edge.get(name)
+        if found is not None:
+            return found
         if isinstance(name, Node):
-            for x in self.nodes:
-                if x.id == name:
-                    return x
-        elif isinstance(name, Edge):
-            for x in self.edges:
-                if x.id == name:
-                    return x
-        else:
-            for x in self.nodes:
-                if x.id == name:
-                    return x
-            for x in self.edges:
-                if x.id == name:
-                    return x
+            return self._id_to_node.get(name.id)
+        if isinstance(name, Edge):
+            return self._id_to_edge.get(name.id)
+        return None
 
     def get_all_node_parents(self, start: Node,
                              parents: Optional[List[Node]] = None) -> Optional[List[Node]]:
-        total = [
-            self[e.to_id]
-            for e in self.edges
-            if e.from_id == start.id
-        ]
-        if not total or len(total) == 0:
-            return None
-        for found_node in total:
-            if found_node.get_property("label").find(":") < 0:
-                continue
-            if not parents or found_node not in parents:
-                children = self.get_all_node_parents(found_node, parents=total)
-                if children:
-                    for child in children:
-                        if child not in total:
-                            total.append(child)
-        return total
+        """
+        Follow outgoing edges from _start_ and collect every node reached.
+        Only nodes whose `label` contains a colon are followed further; other
+        nodes are returned but not expanded.  Each node is visited once, so
+        cycles terminate, and _start_ itself is never returned, even when a
+        cycle or self-loop leads back to it.
+        :param start: Node to begin the search from
+        :param parents: Unused.  Kept for backwards compatibility.
+        :return: List of parent nodes, or None if _start_ has no parents
+        """
+        visited = {start.id}
+        stack = [start.id]
+        found = []
+        while stack:
+            nid = stack.pop()
+            for e in self._out.get(nid, ()):
+                if e.to_id in visited:
+                    continue
+                visited.add(e.to_id)
+                found_node = self._id_to_node.get(e.to_id)
+                if found_node is None:
+                    continue
+                found.append(found_node)
+                label = found_node.get_property("label", no_error=True)
+                if label and ':' in label:
+                    stack.append(e.to_id)
+        return found or None
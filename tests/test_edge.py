@@ -74,3 +74,35 @@ class BuildEdgesTestCase(unittest.TestCase):
                                  'label': 'MyEdge',
                                  'short_details': self.good_properties
                              })
+
+    def test_edge_items(self):
+        edge = Edge(from_id=self.from_id,
+                    to_id=self.to_id,
+                    properties=self.good_properties)
+        expected = self.good_properties | {'id': edge.id,
+                                           'start': self.from_id,
+                                           'end': self.to_id}
+        self.assertDictEqual(dict(edge.items()), expected)
+        self.assertDictEqual(edge.as_dict(), expected)
+        with self.assertWarns(DeprecationWarning):
+            self.assertDictEqual(edge.__dict__(), expected)
+
+    def test_edge_serialize_cache(self):
+        edge = Edge(from_id=self.from_id,
+                    to_id=self.to_id,
+                    properties={'label': 'MyEdge', 'weight': 1})
+        first = edge.serialize()
+        first['start'] = str(first['start'])
+        first['short_details']['weight'] = 2
+        self.assertEqual(edge.serialize()['start'], self.from_id)
+        self.assertEqual(edge.serialize()['short_details'], {'weight': 1})
+        new_to = uuid.uuid4()
+        edge.to_id = new_to
+        self.assertEqual(edge.serialize()['end'], new_to)
+        edge.set_property('weight', 3)
+        self.assertEqual(edge.serialize(),
+                         {'id': edge.id,
+                          'start': self.from_id,
+                          'end': new_to,
+                          'label': 'MyEdge',
+                          'short_details': {'weight': 3}})
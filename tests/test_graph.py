@@ -1,7 +1,16 @@
+import copy
+import dataclasses
+import enum
+import gc
+import json
+import pickle
 import unittest
 import uuid
+import weakref
+from unittest import mock
 
 from src.internalgraph_indifferentcats import Edge, InternalGraph, Node
+from src.internalgraph_indifferentcats import internalgraph
 
 
 class GraphTestCase(unittest.TestCase):
@@ -86,3 +95,213 @@ class GraphTestCase(unittest.TestCase):
         self.graph_ABC.add_node(self.node_D)
         self.graph_ABC.add_edge(self.edge_cd)
         self.assertIn(self.edge_cd, self.graph_ABC.edges)
+
+    def test_neighbors_after_add_edge(self):
+        self.graph_ABC.add_node(self.node_D)
+        self.graph_ABC.add_edge([self.edge_cd])
+        neighbors = list(self.graph_ABC.get_node_neighbors(self.node_D.id))
+        self.assertEqual(neighbors, [self.node_C.id])
+        all_edges = list(self.graph_ABC.get_all_edges([
+            self.node_C.id,
+            self.node_D.id
+        ]))
+        self.assertEqual(all_edges, [self.edge_cd])
+
+    def test_edges_order(self):
+        g = InternalGraph(nodes=[self.node_A, self.node_B, self.node_C,
+                                 self.node_D, self.node_F],
+                          edges=[self.edge_df, self.edge_ac])
+        g.add_edge([self.edge_cd, self.edge_cb])
+        all_edges = list(g.get_all_edges([
+            self.node_F.id,
+            self.node_D.id,
+            self.node_C.id,
+            self.node_B.id,
+            self.node_A.id
+        ]))
+        self.assertEqual(all_edges, [self.edge_df, self.edge_ac,
+                                     self.edge_cd, self.edge_cb])
+
+    def test_all_node_parents(self):
+        self.node_C.set_property("label", "C:expand")
+        self.node_D.set_property("label", "D")
+        g = InternalGraph(nodes=[self.node_A, self.node_B, self.node_C,
+                                 self.node_D, self.node_F],
+                          edges=[self.edge_ac, self.edge_cb, self.edge_cd,
+                                 self.edge_df])
+        parents = g.get_all_node_parents(self.node_A)
+        self.assertCountEqual(parents, [self.node_C, self.node_B, self.node_D])
+        self.assertIsNone(g.get_all_node_parents(self.node_F))
+
+    def test_all_node_parents_cycle(self):
+        loop = Edge(from_id=self.node_A.id, to_id=self.node_A.id)
+        g = InternalGraph(nodes=[self.node_A], edges=[loop])
+        self.assertIsNone(g.get_all_node_parents(self.node_A))
+
+    def test_getitem(self):
+        self.assertIs(self.graph_ABC[self.node_A.id], self.node_A)
+        self.assertIs(self.graph_ABC[self.edge_ac.id], self.edge_ac)
+        self.assertIs(self.graph_ABC[self.node_B], self.node_B)
+        self.assertIs(self.graph_ABC[self.edge_cb], self.edge_cb)
+        self.assertIsNone(self.graph_ABC[uuid.uuid4()])
+
+    def test_property_cache_updates(self):
+        self.assertEqual(self.graph_ABC.get_all_node_property_values("name"),
+                         {"A", "B", "C"})
+        self.graph_ABC.get_all_node_property_names()
+        self.graph_ABC.add_node(self.node_D)
+        self.node_D.set_property("key4", "value9")
+        self.assertIn("key4", self.graph_ABC.get_all_node_property_names())
+        self.assertEqual(self.graph_ABC.get_all_node_property_values("name"),
+                         {"A", "B", "C", "D"})
+        self.assertEqual(self.graph_ABC.get_all_edge_property_values("key10"),
+                         {"value6", "value7"})
+
+    def test_dropped_graph_is_freed(self):
+        sub = InternalGraph(nodes=[self.node_A, self.node_C],
+                            edges=list(self.graph_ABC.get_all_edges(
+                                [self.node_A.id, self.node_C.id])))
+        sub_ref = weakref.ref(sub)
+        sub.get_all_node_property_names()
+        self.graph_ABC.get_all_node_property_names()
+        self.node_A.set_property("key8", "value12")
+        self.assertIn("key8", sub.get_all_node_property_names())
+        self.assertIn("key8", self.graph_ABC.get_all_node_property_names())
+        del sub
+        gc.collect()
+        self.assertIsNone(sub_ref())
+        self.node_A.set_property("key9", "value11")
+        self.assertIn("key9", self.graph_ABC.get_all_node_property_names())
+
+    def test_copy_graph(self):
+        for copier in (copy.deepcopy,
+                       lambda g: pickle.loads(pickle.dumps(g))):
+            g = InternalGraph(nodes=[Node(properties={"label": "x"})])
+            self.assertEqual(g.get_all_node_property_names(), {"id", "label"})
+            g2 = copier(g)
+            g2.nodes[0].set_property("new", 1)
+            self.assertEqual(g2.get_all_node_property_names(),
+                             {"id", "label", "new"})
+            self.assertEqual(g.get_all_node_property_names(), {"id", "label"})
+            g3 = copier(g)
+            g3.get_all_node_property_names()
+            g3.nodes[0].set_property("other", 2)
+            self.assertIn("other", g3.get_all_node_property_names())
+
+    def test_copy_element(self):
+        copied = copy.deepcopy(self.edge_ac)
+        self.assertEqual(copied.id, self.edge_ac.id)
+        self.assertEqual(copied.to_id, self.node_C.id)
+        self.assertIsNone(copied._graphs)
+        restored = pickle.loads(pickle.dumps(self.node_A))
+        self.assertEqual(restored.id, self.node_A.id)
+        self.assertEqual(restored._properties, self.node_A._properties)
+
+    def test_as_javascript(self):
+        lines = self.graph_ABC.as_javascript().split(");\n")
+        self.assertEqual(sum(x.count("nodes.push(") for x in lines), 3)
+        self.assertEqual(sum(x.count("edges.push(") for x in lines), 2)
+        self.assertIn(f'"id": "{self.node_A.id}"',
+                      self.graph_ABC.as_javascript())
+
+    def test_edges_order_from_set(self):
+        ids = ["a", "b", "c", "d", "e"]
+        edges = [Edge(from_id=x, to_id=y, id=x + y)
+                 for x, y in zip(ids, ids[1:])]
+        g = InternalGraph(nodes=[Node(id=x) for x in ids], edges=edges)
+        for node_ids in (set(ids), frozenset(ids), reversed(ids)):
+            self.assertEqual(list(g.get_all_edges(node_ids)), edges)
+
+    def test_as_json(self):
+        parsed = json.loads(self.graph_ABC.as_json())
+        self.assertEqual([n["id"] for n in parsed["nodes"]],
+                         [str(self.node_A.id), str(self.node_B.id),
+                          str(self.node_C.id)])
+        self.assertEqual(parsed["edges"][0]["start"], str(self.node_A.id))
+        self.assertEqual(json.loads(self.graph_ABC.as_json(indent=None)),
+                         parsed)
+        self.assertEqual(json.loads(self.graph_ABC.as_json(indent=4)),
+                         parsed)
+
+    def test_as_json_orjson_fallback(self):
+        self.node_A.set_property("cafe", "café")
+        self.node_B.set_property("big", 2 ** 70)
+        with mock.patch.object(internalgraph, "orjson", None):
+            plain = self.graph_ABC.as_json()
+            self.assertIn('"caf\\u00e9"', plain)
+        self.assertEqual(json.loads(self.graph_ABC.as_json()),
+                         json.loads(plain))
+        # the big int is beyond orjson, so the json module wrote it all
+        self.assertEqual(self.graph_ABC.as_json(), plain)
+        self.assertIn(str(2 ** 70), plain)
+
+    @unittest.skipIf(internalgraph.orjson is None, "orjson not installed")
+
+    def test_as_json_orjson_non_ascii(self):
+        self.node_A.set_property("cafe", "café")
+        fast = self.graph_ABC.as_json()
+        with mock.patch.object(internalgraph, "orjson", None):
+            plain = self.graph_ABC.as_json()
+        self.assertIn('"café"', fast)
+        self.assertIn('"caf\\u00e9"', plain)
+        self.assertEqual(json.loads(fast), json.loads(plain))
+
+    def test_as_json_orjson_matches_json_errors(self):
+        class Color(enum.Enum):
+            RED = "red"
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+
+        for value in ({uuid.uuid4(): 1}, Point(1)):
+            self.node_A.set_property("odd", value)
+            with self.assertRaises(TypeError):
+                self.graph_ABC.as_json()
+        self.node_A.set_property("odd", {1: "a"})
+        with mock.patch.object(internalgraph, "orjson", None):
+            plain = self.graph_ABC.as_json()
+        self.assertEqual(self.graph_ABC.as_json(), plain)
+        self.node_A.set_property("odd", Color.RED)
+        if internalgraph.orjson is None:
+            with self.assertRaises(TypeError):
+                self.graph_ABC.as_json()
+        else:  # documented difference
+            self.assertIn('"odd": "red"', self.graph_ABC.as_json())
+
+    def test_add_node_duplicates(self):
+        self.assertEqual(self.graph_ABC.add_node(self.node_D), [self.node_D])
+        self.assertEqual(self.graph_ABC.add_node(self.node_D), [])
+        self.assertEqual(self.graph_ABC.add_node([self.node_A, self.node_E]),
+                         [self.node_E])
+        self.assertEqual(len(self.graph_ABC.nodes), 5)
+        self.assertIs(self.graph_ABC[self.node_E.id], self.node_E)
+
+    def test_add_edge_duplicates(self):
+        self.graph_ABC.add_edge(self.edge_ac)
+        self.graph_ABC.add_edge([self.edge_cb, self.edge_cd, self.edge_cd])
+        self.assertEqual(self.graph_ABC.edges,
+                         [self.edge_ac, self.edge_cb, self.edge_cd])
+        neighbors = list(self.graph_ABC.get_node_neighbors(self.node_A.id))
+        self.assertEqual(neighbors, [self.node_C.id])
+
+    def test_neighbors_self_loop(self):
+        edge_aa = Edge(from_id=self.node_A.id, to_id=self.node_A.id)
+        self.graph_ABC.add_edge(edge_aa)
+        neighbors = list(self.graph_ABC.get_node_neighbors(self.node_A.id))
+        self.assertEqual(neighbors.count(self.node_A.id), 2)
+        self.assertIn(self.node_C.id, neighbors)
+
+    def test_cached_property_names(self):
+        names = self.graph_ABC.get_all_node_property_names()
+        names.add("not_a_key")
+        self.assertNotIn("not_a_key",
+                         self.graph_ABC.get_all_node_property_names())
+        self.graph_ABC.add_node(self.node_D)
+        self.node_D.set_property("key5", "value10")
+        self.assertNotIn("key5", names)
+        self.assertIn("key5", self.graph_ABC.get_all_node_property_names())
+        self.graph_ABC.add_edge(self.edge_cd)
+        self.assertEqual(self.graph_ABC.get_all_edge_property_names(),
+                         {"id", "name", "key1", "key10", "key11",
+                          "start", "end"})
@@ -1,5 +1,6 @@
 import unittest
 import uuid
+import weakref
 
 from src import internalgraph_indifferentcats
 from src.internalgraph_indifferentcats import Node
@@ -46,3 +47,79 @@ class BuildNodesTestCase(unittest.TestCase):
                          {"a": 1, "e": [4, 5, 6]})
         self.assertEqual(right,
                          {"b": 2, "c": {"d": 3}})
+
+    def test_bulk_create(self):
+        props = [{'label': 'one'}, {'label': 'two'}, None]
+        nodes = Node.bulk_create(3, props)
+        self.assertEqual(len(nodes), 3)
+        self.assertEqual(len({n.id for n in nodes}), 3)
+        for n in nodes:
+            self.assertIsInstance(n.id, uuid.UUID)
+            self.assertEqual(n.id.version, 4)
+        self.assertEqual(nodes[1].get_property('label'), 'two')
+        self.assertEqual(nodes[2]._properties, {})
+        with self.assertRaises(ValueError):
+            Node.bulk_create(2, props)
+
+    def test_node_slots(self):
+        node = Node()
+        with self.assertRaises(AttributeError):
+            node.not_a_slot = 1
+
+    def test_node_weakref(self):
+        node = Node()
+        self.assertIs(weakref.ref(node)(), node)
+
+    def test_node_iter(self):
+        node = Node(properties={'label': 'x', 'type': 'y'})
+        self.assertEqual(list(node), ['label', 'type', node.id])
+
+    def test_split_dict_disjoint(self):
+        source = {"a": 1, "b": 2}
+        left, right = internalgraph_indifferentcats.BaseGraphElement.split_dict(
+            in_dict=source, strip_list=["c"]
+        )
+        self.assertEqual(left, {})
+        self.assertEqual(right, source)
+        self.assertIsNot(right, source)
+        with self.assertRaises(ValueError):
+            internalgraph_indifferentcats.BaseGraphElement.split_dict(
+                in_dict=source, strip_list=[]
+            )
+
+    def test_get_property(self):
+        node = Node(properties={'label': 'x', 'empty': None})
+        self.assertEqual(node.get_property('id'), node.id)
+        self.assertIsNone(node.get_property('empty'))
+        self.assertIsNone(node.get_property('missing', no_error=True))
+        with self.assertRaises(KeyError):
+            node.get_property('missing')
+
+    def test_get_property_id_precedence(self):
+        node = Node(properties={'id': 'custom'})
+        self.assertEqual(node.get_property('id'), node.id)
+        self.assertEqual(node.as_dict()['id'], node.id)
+        self.assertEqual(node.serialize()['id'], node.id)
+
+    def test_serialize_cache(self):
+        node = Node(properties={'label': 'x', 'color': 'red'})
+        first = node.serialize()
+        first["short_details"]["color"] = "green"
+        first["id"] = str(first["id"])
+        self.assertEqual(node.serialize(),
+                         {'id': node.id, 'label': 'x',
+                          'short_details': {'color': 'red'}})
+        node.set_property('color', 'blue')
+        self.assertEqual(node.serialize(),
+                         {'id': node.id, 'label': 'x',
+                          'short_details': {'color': 'blue'}})
+
+    def test_properties_copied(self):
+        props = {'label': 'x'}
+        node = Node(properties=props)
+        node.serialize()
+        props['color'] = 'red'
+        self.assertNotIn('color', node.serialize()['short_details'])
+        node.set_property('color', 'blue')
+        self.assertEqual(node.serialize()['short_details'], {'color': 'blue'})
+        self.assertEqual(props, {'label': 'x', 'color': 'red'})